@@ -0,0 +1,26 @@
+"""Add index on bookings.customer_age
+
+Revision ID: 4b7e2c91a3d5
+Revises: d110fffbcf6a
+Create Date: 2026-10-15 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2c91a3d5'
+down_revision: Union[str, None] = 'd110fffbcf6a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_bookings_customer_age'), 'bookings', ['customer_age'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_bookings_customer_age'), table_name='bookings')
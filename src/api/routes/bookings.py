@@ -5,6 +5,7 @@ from src.database.database import get_db
 from src.schemas import schemas
 from src.crud import crud
 from src.services.email_service import email_service
+from src.services.analytics_service import AnalyticsService
 
 router = APIRouter()
 
@@ -24,12 +25,16 @@ def create_booking(
         # Create the booking
         db_booking = crud.create_booking(db=db, booking=booking)
         
+        # Keep the distinct-customer sketch used by the dashboard current
+        AnalyticsService(db).record_customer(db_booking.customer_email)
+        
         # Get booking summary for emails
         booking_summary = crud.get_booking_summary(db, db_booking)
     
-        # Send emails in background
-        # background_tasks.add_task(email_service.send_booking_confirmation, db_booking, booking_summary)
-        background_tasks.add_task(email_service.send_admin_notification, db_booking, booking_summary)
+        # Send emails in background; they're rendered now so the task holds
+        # plain strings rather than ORM objects
+        # background_tasks.add_task(email_service.send_email, *email_service.booking_confirmation_email(db_booking, booking_summary), retry=True)
+        background_tasks.add_task(email_service.send_email, *email_service.admin_notification_email(db_booking, booking_summary), retry=True)
         
         return schemas.BookingResponse(
             booking=db_booking,
@@ -73,11 +78,11 @@ def get_bookings(skip: int = 0, limit: int = 100, db: Session = Depends(get_db))
 
 
 @router.post("/test-email")
-def test_email():
+async def test_email():
     """Test email configuration"""
     try:
         # Create a simple test email
-        result = email_service.send_email(
+        result = await email_service.send_email(
             to_email=email_service.admin_email,
             subject="Test Email - Afro Nyanka Tours",
             html_content="""
@@ -34,7 +34,8 @@ def send_contact_email(
             contact_form.name,
             contact_form.email,
             contact_form.subject,
-            contact_form.message
+            contact_form.message,
+            retry=True
         )
         
         logger.info(f"Contact form submitted by {contact_form.name} ({contact_form.email})")
@@ -55,7 +56,7 @@ def send_contact_email(
 
 
 @router.post("/test", response_model=ContactResponse)
-def test_contact_email():
+async def test_contact_email():
     """
     Test contact form email functionality (for development/testing)
     """
@@ -67,7 +68,7 @@ def test_contact_email():
             message="This is a test message to verify the contact form functionality is working correctly."
         )
         
-        result = email_service.send_contact_form_email(
+        result = await email_service.send_contact_form_email(
             test_form.name,
             test_form.email,
             test_form.subject,
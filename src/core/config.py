@@ -13,6 +13,8 @@ class Settings(BaseSettings):
     smtp_username: Optional[str] = None
     smtp_password: Optional[str] = None
     admin_email: Optional[str] = None
+    # Zip of precompiled email templates (python -m src.services.email_service --precompile)
+    compiled_templates_path: Optional[str] = None
     
     # Cloudinary settings
     CLOUDINARY_CLOUD_NAME: Optional[str] = None
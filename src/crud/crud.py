@@ -375,15 +375,17 @@ def get_booking_summary(db: Session, booking: models.Booking) -> Dict:
     
     # Add tour details with their locations
     for bt in booking.booking_tours:
+        selected_locations = sorted(
+            tour_locations.get(bt.tour_id, []),
+            key=lambda x: x["order"]
+        )
         tour_info = {
             "tour_id": bt.tour.id,
             "tour_name": bt.tour.name,
             "country": bt.tour.country,
             "region": bt.tour.region,
-            "selected_locations": sorted(
-                tour_locations.get(bt.tour_id, []),
-                key=lambda x: x["order"]
-            )
+            "location_count": len(selected_locations),
+            "selected_locations": selected_locations
         }
         summary["tours_and_locations"].append(tour_info)
     
@@ -1,9 +1,19 @@
+import logging
+import sys
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.core.config import settings
 from src.api.routes import tours, bookings, analytics, contact
 from src.database.database import engine
 from src.models import models
+from src.services.email_service import email_service
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
 
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
@@ -29,6 +39,10 @@ app.include_router(bookings.router, prefix="/api/bookings", tags=["bookings"])
 app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
 app.include_router(contact.router, prefix="/api/contact", tags=["contact"])
 
+@app.on_event("shutdown")
+async def close_smtp_connections():
+    await email_service.close()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Afro Nyanka Tours API"}
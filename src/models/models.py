@@ -60,7 +60,7 @@ class Booking(Base):
     # Customer information
     customer_name = Column(String, nullable=False)
     customer_email = Column(String, nullable=False)
-    customer_age = Column(Integer)
+    customer_age = Column(Integer, index=True)
     customer_country = Column(String)
     
     # Booking details
@@ -0,0 +1,169 @@
+"""Renderers for the emails sent by EmailService"""
+import hashlib
+import logging
+import os
+import re
+import zipfile
+from html import escape
+
+from jinja2 import ChoiceLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "email")
+
+_WHITESPACE_RUN = re.compile(r"\s{2,}")
+_INTERTAG_WHITESPACE = re.compile(r"(>|%})\s+(?=<|{%)")
+_HTML_COMMENT = re.compile(r"<!--.*?-->", re.S)
+# <style> elements, and the style blocks that child templates fill in
+_STYLE_BLOCK = re.compile(r"(<style>)(.*?)(</style>)|({% block style %})(.*?)({% endblock %})", re.S)
+_CSS_PUNCTUATION_SPACE = re.compile(r"\s*([{};,])\s*|(:)\s+")
+
+
+def _minify_css(css: str) -> str:
+    """Drop whitespace around CSS punctuation and redundant trailing semicolons"""
+    return _CSS_PUNCTUATION_SPACE.sub(r"\1\2", css).replace(";}", "}").strip()
+
+
+def _minify_style(match: re.Match) -> str:
+    start, css, end = match.groups()[:3] if match.group(1) else match.groups()[3:]
+    return start + _minify_css(css) + end
+
+
+def _minify(source: str) -> str:
+    """Collapse indentation and whitespace between tags once, at load time"""
+    source = _HTML_COMMENT.sub("", source)
+    source = _STYLE_BLOCK.sub(_minify_style, source)
+    return _INTERTAG_WHITESPACE.sub(r"\1", _WHITESPACE_RUN.sub(" ", source)).strip()
+
+
+class _MinifyingLoader(FileSystemLoader):
+    """FileSystemLoader that minifies each template source before it is compiled"""
+
+    def get_source(self, environment, template):
+        source, filename, uptodate = super().get_source(environment, template)
+        return _minify(source), filename, uptodate
+
+
+_TEMPLATE_SOURCES = _MinifyingLoader(TEMPLATES_DIR)
+
+# Zip entry recording which sources a precompiled zip was built from
+_SOURCE_DIGEST_ENTRY = "source_digest.txt"
+
+
+def _source_digest() -> str:
+    """Hash of the template sources and of this module (which minifies them)"""
+    digest = hashlib.sha256()
+    for path in [__file__] + [os.path.join(TEMPLATES_DIR, name) for name in sorted(_TEMPLATE_SOURCES.list_templates())]:
+        digest.update(os.path.basename(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _precompiled_loader(path: str):
+    """ModuleLoader for a precompiled zip, or None if it's missing or stale"""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            current = archive.read(_SOURCE_DIGEST_ENTRY).decode("ascii") == _source_digest()
+    except (OSError, KeyError, zipfile.BadZipFile):
+        current = False
+    if not current:
+        # e.g. templates edited on a mounted source tree after the image was built
+        logger.info("Ignoring precompiled email templates at %s: missing or built from other template sources", path)
+        return None
+    return ModuleLoader(path)
+
+
+_PRECOMPILED = _precompiled_loader(settings.compiled_templates_path) if settings.compiled_templates_path else None
+
+# Templates are compiled on first use (see EmailService._get_template). Images
+# built with precompiled modules (compile_templates) load those directly, as
+# long as they were built from the current sources; otherwise the bytecode
+# cache lets restarted workers skip lexing and parsing.
+# Customer-supplied values are HTML-escaped on render.
+TEMPLATE_ENV = Environment(
+    loader=ChoiceLoader([_PRECOMPILED, _TEMPLATE_SOURCES]) if _PRECOMPILED else _TEMPLATE_SOURCES,
+    autoescape=True,
+    bytecode_cache=FileSystemBytecodeCache(pattern="__ank_%s.cache"),
+    auto_reload=False
+)
+
+
+def compile_templates(target: str) -> None:
+    """Write the email templates as a zip of importable Python modules (run at build time)"""
+    Environment(loader=_TEMPLATE_SOURCES, autoescape=True).compile_templates(target, zip="deflated")
+    with zipfile.ZipFile(target, "a") as archive:
+        archive.writestr(_SOURCE_DIGEST_ENTRY, _source_digest())
+
+
+# The customer confirmation is the highest-volume email, so it skips Jinja
+# and is rendered by a specialized function; the markup is pre-minified
+_BOOKING_HEAD = (
+    '<!DOCTYPE html><html><head><style>'
+    'body{font-family:Arial,sans-serif;margin:0;padding:20px}'
+    '.container{max-width:600px;margin:0 auto}'
+    '.header{background-color:#2E8B57;color:white;padding:20px;text-align:center}'
+    '.content{padding:20px;border:1px solid #ddd}'
+    '.booking-details{background-color:#f9f9f9;padding:15px;margin:15px 0}'
+    '.tour-section{margin:20px 0;padding:15px;border-left:4px solid #2E8B57;background-color:#f8f9fa}'
+    '.location-list{margin:10px 0;padding-left:20px}'
+    '.location-item{margin:5px 0}'
+    '.footer{text-align:center;padding:20px;color:#666}'
+    '.summary-stats{display:flex;justify-content:space-around;margin:20px 0}'
+    '.stat{text-align:center}'
+    '.stat-number{font-size:24px;font-weight:bold;color:#2E8B57}'
+    '.stat-label{font-size:14px;color:#666}'
+    '</style></head><body><div class="container">'
+    '<div class="header"><h1>Afro Nyanka Tours</h1><h2>Multi-Tour Booking Confirmation</h2></div>'
+    '<div class="content">'
+)
+
+_BOOKING_FOOT = (
+    '<p>We will contact you shortly to confirm your booking and provide a detailed itinerary for your multi-tour experience.</p>'
+    "<p>If you have any questions, please don't hesitate to contact us.</p>"
+    '</div>'
+    '<div class="footer"><p>Best regards,<br>Afro Nyanka Tours Team</p></div>'
+    '</div></body></html>'
+)
+
+
+def render_booking_confirmation(
+    customer_name, start_date, end_date, customer_age, additional_services,
+    number_of_people, total_tours, total_locations, tours_and_locations
+) -> str:
+    """Render the customer confirmation; tours need tour_name/country/region/selected_locations attributes"""
+    html = [
+        f'{_BOOKING_HEAD}<p>Dear {escape(customer_name)},</p>'
+        '<p>Thank you for your exciting multi-tour booking with Afro Nyanka Tours! '
+        'Your personalized travel experience has been received and is being processed.</p>'
+        '<div class="summary-stats">'
+        f'<div class="stat"><div class="stat-number">{total_tours}</div><div class="stat-label">Tours Selected</div></div>'
+        f'<div class="stat"><div class="stat-number">{total_locations}</div><div class="stat-label">Locations</div></div>'
+        f'<div class="stat"><div class="stat-number">{number_of_people}</div><div class="stat-label">People</div></div>'
+        '</div>'
+        '<div class="booking-details"><h3>Customer Details:</h3>'
+        f'<p><strong>Start Date:</strong> {escape(start_date)}</p>'
+        f'<p><strong>End Date:</strong> {escape(end_date)}</p>'
+    ]
+    if customer_age:
+        html.append(f'<p><strong>Age:</strong> {customer_age}</p>')
+    if additional_services:
+        html.append(f'<p><strong>Additional Services:</strong> {escape(additional_services)}</p>')
+    html.append('</div><h3>Your Selected Tours &amp; Locations:</h3>')
+
+    for index, tour in enumerate(tours_and_locations, 1):
+        html.append(
+            f'<div class="tour-section"><h4>{index}. {escape(tour.tour_name)} ({escape(tour.country)})</h4>'
+            f'<p><em>{escape(tour.region or "")}</em></p>'
+            '<div class="location-list"><strong>Selected Locations:</strong>'
+        )
+        html.extend(
+            f'<div class="location-item">• {escape(location.location_name)}</div>'
+            for location in tour.selected_locations
+        )
+        html.append('</div></div>')
+
+    html.append(_BOOKING_FOOT)
+    return "".join(html)
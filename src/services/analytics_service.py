@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract, desc, and_, case
+from sqlalchemy import func, extract, desc, and_
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.exc import IntegrityError
 from src.models import models
+from src.services.hyperloglog import HyperLogLog
 from src.models.analytics import (
     MonthlyBookingStats, LocationPopularity, TourPopularity, 
     CustomerDemographics, BookingAnalytics
@@ -12,6 +15,14 @@ import json
 import calendar
 
 
+# booking_analytics row holding the HyperLogLog sketch of customer emails
+CUSTOMER_SKETCH_METRIC = "customer_email_hll"
+
+# Lower bounds passed to width_bucket; bucket N maps to AGE_GROUP_LABELS[N]
+AGE_BUCKET_BOUNDARIES = [25, 35, 45, 55, 65]
+AGE_GROUP_LABELS = ["Under 25", "25-34", "35-44", "45-54", "55-64", "65+"]
+
+
 class AnalyticsService:
     def __init__(self, db: Session):
         self.db = db
@@ -24,7 +35,7 @@ class AnalyticsService:
         
         # Basic counts
         total_bookings = self.db.query(models.Booking).count()
-        total_customers = self.db.query(models.Booking.customer_email).distinct().count()
+        total_customers = self.get_customer_count_estimate()
         total_tours = self.db.query(models.Tour).filter(models.Tour.is_active == True).count()
         total_locations = self.db.query(models.Location).count()
         
@@ -209,25 +220,19 @@ class AnalyticsService:
                 "bookings_per_customer": round(row.total_bookings / row.unique_customers, 2)
             })
         
-        # Age distribution
+        # Age distribution, bucketed in the database by width_bucket
+        age_bucket = func.width_bucket(models.Booking.customer_age, array(AGE_BUCKET_BOUNDARIES))
         age_distribution = self.db.query(
-            case(
-                (models.Booking.customer_age < 25, "Under 25"),
-                (models.Booking.customer_age < 35, "25-34"),
-                (models.Booking.customer_age < 45, "35-44"),
-                (models.Booking.customer_age < 55, "45-54"),
-                (models.Booking.customer_age < 65, "55-64"),
-                else_="65+"
-            ).label('age_group'),
+            age_bucket.label('bucket'),
             func.count(models.Booking.id).label('booking_count')
         ).filter(
             models.Booking.customer_age.isnot(None)
-        ).group_by('age_group').all()
+        ).group_by('bucket').order_by('bucket').all()
         
         age_groups = []
         for row in age_distribution:
             age_groups.append({
-                "age_group": row.age_group,
+                "age_group": AGE_GROUP_LABELS[row.bucket],
                 "booking_count": row.booking_count
             })
         
@@ -507,3 +512,61 @@ class AnalyticsService:
             # Log error but don't fail the main operation
             print(f"Failed to retrieve cached analytics: {str(e)}")
             return None
+
+    def _build_customer_sketch(self) -> BookingAnalytics:
+        """Build the customer email sketch from all bookings and store it"""
+        sketch = HyperLogLog()
+        for (email,) in self.db.query(models.Booking.customer_email).yield_per(1000):
+            sketch.add(email)
+
+        sketch_row = BookingAnalytics(
+            metric_name=CUSTOMER_SKETCH_METRIC,
+            metric_value=sketch.count(),
+            metric_data=sketch.to_string(),
+            last_calculated=datetime.now(timezone.utc)
+        )
+        self.db.add(sketch_row)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Another request stored the sketch first; use that one
+            self.db.rollback()
+            sketch_row = self.db.query(BookingAnalytics).filter(
+                BookingAnalytics.metric_name == CUSTOMER_SKETCH_METRIC
+            ).one()
+        return sketch_row
+
+    def get_customer_count_estimate(self) -> int:
+        """Get the approximate number of distinct customers from the stored sketch"""
+        sketch_row = self.db.query(BookingAnalytics).filter(
+            BookingAnalytics.metric_name == CUSTOMER_SKETCH_METRIC
+        ).first()
+
+        if sketch_row is None:
+            sketch_row = self._build_customer_sketch()
+
+        return int(sketch_row.metric_value)
+
+    def record_customer(self, customer_email: str) -> None:
+        """Add a booking's customer email to the distinct-customer sketch"""
+        try:
+            sketch_row = self.db.query(BookingAnalytics).filter(
+                BookingAnalytics.metric_name == CUSTOMER_SKETCH_METRIC
+            ).with_for_update().first()
+
+            if sketch_row is None:
+                # First use: the scan already includes the new booking
+                self._build_customer_sketch()
+                return
+
+            sketch = HyperLogLog.from_string(sketch_row.metric_data)
+            if sketch.add(customer_email):
+                sketch_row.metric_data = sketch.to_string()
+                sketch_row.metric_value = sketch.count()
+                sketch_row.last_calculated = datetime.now(timezone.utc)
+            self.db.commit()
+
+        except Exception as e:
+            self.db.rollback()
+            # Log error but don't fail the main operation
+            print(f"Failed to update customer sketch: {str(e)}")
@@ -1,16 +1,49 @@
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
-from cloudinary.utils import cloudinary_url
+from cloudinary.utils import cloudinary_url, smart_escape
 import os
+import re
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
 from fastapi import UploadFile
 import json
 from src.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Cloudinary's Admin API accepts at most 100 public_ids per bulk delete
+BULK_DELETE_LIMIT = 100
+# Cap parallel uploads so they don't exhaust the default threadpool
+MAX_CONCURRENT_UPLOADS = 8
+
+# Delivery URLs are unsigned, so they can be formatted directly instead of
+# going through cloudinary_url for every size variant (None without a cloud name)
+DELIVERY_BASE_URL = (
+    f"https://res.cloudinary.com/{settings.CLOUDINARY_CLOUD_NAME}/image/upload"
+    if settings.CLOUDINARY_CLOUD_NAME else None
+)
+# public_ids that already carry a version, which cloudinary_url leaves as is
+_VERSIONED_PUBLIC_ID = re.compile(r"^v[0-9]+")
+OPTIMIZED_TRANSFORMATIONS = {
+    "thumbnail": "c_fill,h_200,q_auto:low,w_300",
+    "medium": "c_fill,h_400,q_auto:good,w_600",
+    "large": "c_fill,h_800,q_auto:good,w_1200",
+}
+
+
+@lru_cache(maxsize=4096)
+def _build_image_url(public_id: str, transformation: Optional[Tuple[Tuple[str, Any], ...]]) -> str:
+    """Build (and memoize) a Cloudinary URL through the SDK"""
+    url, _ = cloudinary_url(
+        public_id,
+        transformation=dict(transformation) if transformation else None,
+        secure=True
+    )
+    return url
+
 
 class CloudinaryService:
     def __init__(self):
@@ -83,14 +116,17 @@ class CloudinaryService:
             logger.error(f"Failed to upload image to Cloudinary: {str(e)}")
             return None
 
-    def upload_multiple_images(
+    async def upload_multiple_images(
         self, 
         files: List[UploadFile], 
         folder: str = "afro-nyanka-tours",
         transformation: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, str]]:
         """
-        Upload multiple images to Cloudinary
+        Upload multiple images to Cloudinary concurrently
+        
+        Each upload runs in a worker thread; at most MAX_CONCURRENT_UPLOADS
+        are in flight at once so the threadpool is not exhausted.
         
         Args:
             files: List of FastAPI UploadFile objects
@@ -100,14 +136,15 @@ class CloudinaryService:
         Returns:
             List of dictionaries with image URLs and public_ids
         """
-        uploaded_images = []
-        
-        for file in files:
-            result = self.upload_image(file, folder, transformation)
-            if result:
-                uploaded_images.append(result)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+
+        async def upload(file: UploadFile) -> Optional[Dict[str, str]]:
+            async with semaphore:
+                return await asyncio.to_thread(self.upload_image, file, folder, transformation)
+
+        results = await asyncio.gather(*[upload(file) for file in files])
         
-        return uploaded_images
+        return [result for result in results if result]
 
     def delete_image(self, public_id: str) -> bool:
         """
@@ -132,20 +169,31 @@ class CloudinaryService:
             logger.error(f"Error deleting image {public_id}: {str(e)}")
             return False
 
-    def delete_multiple_images(self, public_ids: List[str]) -> Dict[str, bool]:
+    async def delete_multiple_images(self, public_ids: List[str]) -> Dict[str, bool]:
         """
         Delete multiple images from Cloudinary
         
+        Uses the Admin API bulk delete, which accepts up to
+        BULK_DELETE_LIMIT public_ids per request.
+        
         Args:
             public_ids: List of Cloudinary public_ids to delete
             
         Returns:
             Dictionary mapping public_id to deletion success status
         """
-        results = {}
+        results = {public_id: False for public_id in public_ids}
         
-        for public_id in public_ids:
-            results[public_id] = self.delete_image(public_id)
+        for start in range(0, len(public_ids), BULK_DELETE_LIMIT):
+            batch = public_ids[start:start + BULK_DELETE_LIMIT]
+            try:
+                response = await asyncio.to_thread(cloudinary.api.delete_resources, batch)
+                deleted = response.get("deleted", {})
+                for public_id in batch:
+                    results[public_id] = deleted.get(public_id) == "deleted"
+                logger.info(f"Bulk deleted {sum(results[p] for p in batch)} of {len(batch)} images")
+            except Exception as e:
+                logger.error(f"Error bulk deleting images {batch}: {str(e)}")
         
         return results
 
@@ -165,8 +213,14 @@ class CloudinaryService:
             Cloudinary URL for the image
         """
         try:
-            url, _ = cloudinary_url(public_id, transformation=transformation, secure=True)
-            return url
+            key = tuple(sorted(transformation.items())) if transformation else None
+            try:
+                hash(key)
+            except TypeError:
+                # Chained transformations hold lists/dicts, which can't be memoized
+                url, _ = cloudinary_url(public_id, transformation=transformation, secure=True)
+                return url
+            return _build_image_url(public_id, key)
         except Exception as e:
             logger.error(f"Error generating URL for {public_id}: {str(e)}")
             return ""
@@ -182,12 +236,19 @@ class CloudinaryService:
             Dictionary with different sized versions of the image
         """
         try:
-            return {
-                "thumbnail": self.get_image_url(public_id, {"width": 300, "height": 200, "crop": "fill", "quality": "auto:low"}),
-                "medium": self.get_image_url(public_id, {"width": 600, "height": 400, "crop": "fill", "quality": "auto:good"}),
-                "large": self.get_image_url(public_id, {"width": 1200, "height": 800, "crop": "fill", "quality": "auto:good"}),
-                "original": self.get_image_url(public_id)
+            if DELIVERY_BASE_URL is None:
+                raise ValueError("Must supply cloud_name in configuration")
+            # Cloudinary adds a default version to unversioned public_ids stored
+            # in folders; public_ids are escaped the same way cloudinary_url does it
+            path = smart_escape(public_id)
+            if "/" in public_id and not _VERSIONED_PUBLIC_ID.match(public_id):
+                path = f"v1/{path}"
+            urls = {
+                name: f"{DELIVERY_BASE_URL}/{transformation}/{path}"
+                for name, transformation in OPTIMIZED_TRANSFORMATIONS.items()
             }
+            urls["original"] = f"{DELIVERY_BASE_URL}/{path}"
+            return urls
         except Exception as e:
             logger.error(f"Error generating optimized URLs for {public_id}: {str(e)}")
             return {}
@@ -1,684 +1,396 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from jinja2 import Template
+import asyncio
+import aiosmtplib
+import email.charset
+from email.header import Header
+from email.utils import formataddr
 from src.core.config import settings
 from src.schemas.schemas import Booking
+from src.services.smtp_pool import SMTPPool
+from src.services._email_templates import TEMPLATE_ENV, compile_templates, render_booking_confirmation
 import logging
 import sys
-from datetime import datetime
+import time
+from collections import namedtuple
+from datetime import date, datetime
+from functools import lru_cache
+from typing import List, Optional, Set, Tuple
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
 logger = logging.getLogger(__name__)
 
+# Quoted-printable keeps the mostly-ASCII markup readable and compact, and
+# wraps the minified (single-line) HTML within SMTP's line length limit
+_UTF8 = email.charset.Charset("utf-8")
+_UTF8.body_encoding = email.charset.QP
+
+# Display name shown alongside the sending address
+SENDER_NAME = "Afro Nyanka Tours"
+
+# Every email is a single text/html part, so the headers are a fixed layout
+# (the From header is formatted once per EmailService)
+_MESSAGE_HEAD = (
+    "To: %s\r\n"
+    "Subject: %s\r\n"
+    "MIME-Version: 1.0\r\n"
+    "Content-Type: text/html; charset=\"utf-8\"\r\n"
+    "Content-Transfer-Encoding: quoted-printable\r\n"
+    "\r\n"
+)
+
+# Subject lines, bound once so each send is a single % formatting call
+_BOOKING_SUBJECT = "Multi-Tour Booking Confirmation - %d Tours Selected".__mod__
+_ADMIN_SUBJECT = "New Multi-Tour Booking - %s (%d tours)".__mod__
+_CONTACT_SUBJECT = "Contact Form: %s".__mod__
+
+# Backoff between delivery attempts for background sends (~6 hours in total);
+# these run in a detached task, after the request that queued the send is done
+RETRY_DELAYS = (300, 1800, 5400, 14400)
+# Quick retries on a fresh connection when the server drops the session;
+# these apply to every send and don't count against RETRY_DELAYS
+RECONNECT_DELAYS = (0.25, 0.5)
+
+_DROPPED_CONNECTION_ERRORS = (
+    aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPServerDisconnected,
+    ConnectionError
+)
+
+
+def _header_value(value: str) -> str:
+    """Keep a header value on one line, RFC 2047-encoding it if it isn't ASCII"""
+    value = " ".join(value.splitlines())
+    if value.isascii():
+        return value
+    return Header(value, _UTF8).encode(linesep="\r\n")
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether an SMTP failure is worth retrying later"""
+    if isinstance(error, aiosmtplib.SMTPAuthenticationError):
+        # Wrong credentials won't fix themselves
+        return False
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(400 <= recipient.code < 500 for recipient in error.recipients)
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        return 400 <= error.code < 500
+    return isinstance(error, _DROPPED_CONNECTION_ERRORS + (aiosmtplib.SMTPTimeoutError,))
+
+
+# English month names, indexed directly instead of going through strftime's
+# locale handling on every render
+_MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+)
+
+
+def _format_date(value: date) -> str:
+    """Format a date like strftime("%B %d, %Y")"""
+    return f"{_MONTHS[value.month - 1]} {value.day:02d}, {value.year}"
+
+
+def _format_timestamp(value: datetime) -> str:
+    """Format a datetime like strftime("%B %d, %Y at %I:%M %p")"""
+    hour = value.hour % 12 or 12
+    return f"{_format_date(value)} at {hour:02d}:{value.minute:02d} {'AM' if value.hour < 12 else 'PM'}"
+
+
+# [minute, formatted timestamp]; the format has minute resolution, so a
+# burst of emails only formats the current time once
+_current_time_cache = [None, ""]
+
+
+def _current_time() -> str:
+    """The current local time as shown in admin emails, refreshed once a minute"""
+    minute = int(time.time()) // 60
+    if minute != _current_time_cache[0]:
+        _current_time_cache[:] = [minute, _format_timestamp(datetime.now())]
+    return _current_time_cache[1]
+
+
+# Hashable views of the booking summary so rendered HTML can be memoized
+_TourSection = namedtuple("_TourSection", ["tour_name", "country", "region", "selected_locations"])
+_LocationItem = namedtuple("_LocationItem", ["location_name"])
+
+
+def _freeze_tours(tours_and_locations: list) -> tuple:
+    return tuple(
+        _TourSection(
+            tour["tour_name"],
+            tour["country"],
+            tour["region"],
+            tuple(_LocationItem(location["location_name"]) for location in tour["selected_locations"])
+        )
+        for tour in tours_and_locations
+    )
+
+
+@lru_cache(maxsize=512)
+def _render_booking_html(
+    customer_name, start_date, end_date, customer_age, additional_services,
+    number_of_people, total_tours, total_locations, tours_and_locations
+) -> str:
+    """Render the customer confirmation; repeat sends for the same inputs reuse the HTML"""
+    return render_booking_confirmation(
+        customer_name, start_date, end_date, customer_age, additional_services,
+        number_of_people, total_tours, total_locations, tours_and_locations
+    )
+
 
 class EmailService:
+    ADMIN_TEMPLATE = "admin_notification.html.j2"
+    CONTACT_TEMPLATE = "contact_form.html.j2"
+
     def __init__(self):
         self.smtp_server = settings.smtp_server
         self.smtp_port = settings.smtp_port
         self.smtp_username = settings.smtp_username
         self.smtp_password = settings.smtp_password
         self.admin_email = settings.admin_email
+        self.pool = SMTPPool(
+            self.smtp_server,
+            self.smtp_port,
+            self.smtp_username,
+            self.smtp_password
+        )
+        self._from_header = (
+            f"From: {formataddr((SENDER_NAME, self.smtp_username))}\r\n" if self.smtp_username else ""
+        )
+        # Checked once so a misconfigured instance fails fast instead of
+        # waiting on network timeouts for every send
+        self._enabled = bool(
+            self.smtp_server and self.smtp_port and self.smtp_username and self.smtp_password and self.admin_email
+        )
+        # Background retries in flight, kept referenced until they finish
+        self._retries: Set[asyncio.Task] = set()
+        if not self._enabled:
+            logger.warning("Email configuration missing: SMTP_SERVER, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD or ADMIN_EMAIL not set")
 
-    def send_email(self, to_email: str, subject: str, html_content: str):
-        """Send email using Gmail SMTP"""
-        try:
-            # Check if email configuration is properly set
-            if not self.smtp_username or not self.smtp_password:
-                logger.error("Email configuration missing: SMTP_USERNAME or SMTP_PASSWORD not set")
-                return False
-            
-            if not self.admin_email:
-                logger.error("Admin email not configured")
-                return False
-            
-            logger.info(f"Attempting to send email to {to_email}")
-            logger.info(f"Using SMTP server: {self.smtp_server}:{self.smtp_port}")
-            logger.info(f"SMTP username: {self.smtp_username}")
-            
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = self.smtp_username
-            message["To"] = to_email
+    def _get_template(self, name: str):
+        """Compile a template on first use and share it across every EmailService"""
+        attr = f"_{name.partition('.')[0]}_tpl"
+        template = getattr(type(self), attr, None)
+        if template is None:
+            template = TEMPLATE_ENV.get_template(name)
+            setattr(type(self), attr, template)
+        return template
 
-            html_part = MIMEText(html_content, "html")
-            message.attach(html_part)
+    def _build_message(self, to_email: str, subject: str, html_content: str) -> bytes:
+        """Serialize an email straight to RFC 5322 bytes"""
+        head = self._from_header + _MESSAGE_HEAD % (_header_value(to_email), _header_value(subject))
+        body = _UTF8.body_encode(html_content).replace("\n", "\r\n")
+        return (head + body).encode("ascii")
 
-            # Try with SMTP_SSL first (port 465), then fallback to STARTTLS (port 587)
-            try:
-                # Use SMTP_SSL for port 465
-                if self.smtp_port == 465:
-                    logger.info("Using SMTP_SSL on port 465...")
-                    with smtplib.SMTP_SSL(self.smtp_server, self.smtp_port) as server:
-                        server.set_debuglevel(0)  # Disable debug to reduce noise
-                        logger.info("Logging in...")
-                        server.login(self.smtp_username, self.smtp_password)
-                        logger.info("Sending email...")
-                        server.sendmail(self.smtp_username, to_email, message.as_string())
-                else:
-                    # Use STARTTLS for port 587
-                    logger.info("Using STARTTLS on port 587...")
-                    with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                        server.set_debuglevel(0)  # Disable debug to reduce noise
-                        logger.info("Starting TLS...")
-                        server.starttls()
-                        logger.info("Logging in...")
-                        server.login(self.smtp_username, self.smtp_password)
-                        logger.info("Sending email...")
-                        server.sendmail(self.smtp_username, to_email, message.as_string())
-                        
-            except smtplib.SMTPAuthenticationError as e:
-                logger.error(f"SMTP Authentication failed: {str(e)}")
-                logger.error("Please check your Gmail App Password. Make sure 2FA is enabled and you're using an App Password, not your regular password.")
-                return False
-            except smtplib.SMTPConnectError as e:
-                logger.error(f"SMTP Connection failed: {str(e)}")
-                logger.error("Cannot connect to Gmail SMTP server. Check your internet connection.")
-                return False
-            except smtplib.SMTPServerDisconnected as e:
-                logger.error(f"SMTP Server disconnected: {str(e)}")
-                return False
-            
-            logger.info(f"Email sent successfully to {to_email}")
-            return True
+    async def send_email(self, to_email: str, subject: str, html_content: str, retry: bool = False):
+        """Send a single email using Gmail SMTP"""
+        return await self.send_emails([(to_email, subject, html_content)], retry)
+
+    async def send_emails(self, emails: List[Tuple[str, str, str]], retry: bool = False):
+        """
+        Send (to_email, subject, html_content) emails over one pooled SMTP session
+
+        A dropped connection is retried straight away on a fresh session. With
+        retry=True (background sends), transient failures such as 4xx replies
+        are retried with exponential backoff in a detached task, so the request
+        that queued the send (and its database session) isn't held open while
+        it waits; emails already accepted by the server are not sent again.
+        An email the server rejects outright is logged and skipped, and the
+        rest are still sent. Returns whether every email was sent by this call.
+        """
+        if not self._enabled:
+            logger.warning("Email sending is disabled; skipping send")
+            return False
+
+        recipients = ", ".join(to_email for to_email, _, _ in emails)
+        try:
+            logger.debug("Attempting to send email to %s via %s:%s as %s", recipients, self.smtp_server, self.smtp_port, self.smtp_username)
             
-        except Exception as e:
-            logger.error(f"Unexpected error sending email to {to_email}: {str(e)}")
+            pending = [
+                (to_email, self._build_message(to_email, subject, html_content))
+                for to_email, subject, html_content in emails
+            ]
+            rejected = []
+            error = await self._deliver(pending, rejected)
+        except (aiosmtplib.SMTPException, OSError) as e:
+            logger.error(f"Unexpected error sending email to {recipients}: {str(e)}")
             return False
 
-    def send_booking_confirmation(self, booking: Booking, booking_summary: dict):
-        """Send booking confirmation email to customer"""
-        subject = f"Multi-Tour Booking Confirmation - {len(booking.booking_tours)} Tours Selected"
-        
-        html_template = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body { font-family: Arial, sans-serif; margin: 0; padding: 20px; }
-                .container { max-width: 600px; margin: 0 auto; }
-                .header { background-color: #2E8B57; color: white; padding: 20px; text-align: center; }
-                .content { padding: 20px; border: 1px solid #ddd; }
-                .booking-details { background-color: #f9f9f9; padding: 15px; margin: 15px 0; }
-                .tour-section { margin: 20px 0; padding: 15px; border-left: 4px solid #2E8B57; background-color: #f8f9fa; }
-                .location-list { margin: 10px 0; padding-left: 20px; }
-                .location-item { margin: 5px 0; }
-                .footer { text-align: center; padding: 20px; color: #666; }
-                .summary-stats { display: flex; justify-content: space-around; margin: 20px 0; }
-                .stat { text-align: center; }
-                .stat-number { font-size: 24px; font-weight: bold; color: #2E8B57; }
-                .stat-label { font-size: 14px; color: #666; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>Afro Nyanka Tours</h1>
-                    <h2>Multi-Tour Booking Confirmation</h2>
-                </div>
-                <div class="content">
-                    <p>Dear {{ customer_name }},</p>
-                    <p>Thank you for your exciting multi-tour booking with Afro Nyanka Tours! Your personalized travel experience has been received and is being processed.</p>
-                    
-                    <div class="summary-stats">
-                        <div class="stat">
-                            <div class="stat-number">{{ total_tours }}</div>
-                            <div class="stat-label">Tours Selected</div>
-                        </div>
-                        <div class="stat">
-                            <div class="stat-number">{{ total_locations }}</div>
-                            <div class="stat-label">Locations</div>
-                        </div>
-                        <div class="stat">
-                            <div class="stat-number">{{ number_of_people }}</div>
-                            <div class="stat-label">People</div>
-                        </div>
-                    </div>
-                    
-                    <div class="booking-details">
-                        <h3>Customer Details:</h3>
-                        <p><strong>Start Date:</strong> {{ start_date }}</p>
-                        <p><strong>End Date:</strong> {{ end_date }}</p>
-                        {% if customer_age %}
-                        <p><strong>Age:</strong> {{ customer_age }}</p>
-                        {% endif %}
-                        {% if additional_services %}
-                        <p><strong>Additional Services:</strong> {{ additional_services }}</p>
-                        {% endif %}
-                    </div>
-                    
-                    <h3>Your Selected Tours & Locations:</h3>
-                    {% for tour in tours_and_locations %}
-                    <div class="tour-section">
-                        <h4>{{ loop.index }}. {{ tour.tour_name }} ({{ tour.country }})</h4>
-                        <p><em>{{ tour.region }}</em></p>
-                        <div class="location-list">
-                            <strong>Selected Locations:</strong>
-                            {% for location in tour.selected_locations %}
-                            <div class="location-item">• {{ location.location_name }}</div>
-                            {% endfor %}
-                        </div>
-                    </div>
-                    {% endfor %}
-                    
-                    <p>We will contact you shortly to confirm your booking and provide a detailed itinerary for your multi-tour experience.</p>
-                    <p>If you have any questions, please don't hesitate to contact us.</p>
-                </div>
-                <div class="footer">
-                    <p>Best regards,<br>Afro Nyanka Tours Team</p>
-                </div>
-            </div>
-        </body>
-        </html>
+        if error is None:
+            return not rejected
+        if retry and _is_transient(error):
+            self._schedule_retry(pending, error)
+        else:
+            self._log_failure(error, pending[0][0])
+        return False
+
+    async def _deliver(self, pending: List[Tuple[str, bytes]], rejected: List[str]) -> Optional[Exception]:
+        """
+        Send (to_email, message_bytes) pairs in order over one pooled session
+
+        Each message is removed from pending once the server accepts it, or
+        moved to rejected if the server refuses it permanently (a bad address
+        shouldn't hold up the other emails). A dropped connection is reopened
+        after RECONNECT_DELAYS; returns the error that stopped delivery, or
+        None once everything is sent.
         """
+        reconnects = 0
+        while True:
+            # Reuse an authenticated session from the pool (SMTP_SSL on 465, STARTTLS otherwise)
+            try:
+                async with self.pool.get(len(pending)) as server:
+                    while pending:
+                        to_email, message_bytes = pending[0]
+                        try:
+                            await server.sendmail(self.smtp_username, [to_email], message_bytes)
+                        except (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPResponseException) as e:
+                            if _is_transient(e):
+                                raise
+                            logger.error(f"SMTP server rejected email to {to_email}: {str(e)}")
+                            rejected.append(to_email)
+                        else:
+                            logger.info(f"Email sent successfully to {to_email}")
+                        pending.pop(0)
+                return None
+            except (
+                aiosmtplib.SMTPRecipientsRefused,
+                aiosmtplib.SMTPResponseException,
+                aiosmtplib.SMTPTimeoutError,
+                *_DROPPED_CONNECTION_ERRORS
+            ) as e:
+                if isinstance(e, _DROPPED_CONNECTION_ERRORS) and reconnects < len(RECONNECT_DELAYS):
+                    delay = RECONNECT_DELAYS[reconnects]
+                    reconnects += 1
+                    logger.warning(f"SMTP connection lost sending to {pending[0][0]}: {str(e)}. Reconnecting in {delay}s")
+                    await asyncio.sleep(delay)
+                    continue
+                return e
+
+    def _schedule_retry(self, pending: List[Tuple[str, bytes]], error: Exception) -> None:
+        task = asyncio.create_task(self._retry(pending, error))
+        self._retries.add(task)
+        task.add_done_callback(self._retries.discard)
+
+    async def _retry(self, pending: List[Tuple[str, bytes]], error: Exception) -> None:
+        """Retry already-built messages through RETRY_DELAYS, outside the request that queued them"""
+        try:
+            for delay in RETRY_DELAYS:
+                logger.warning(f"Transient SMTP error sending to {pending[0][0]}: {str(error)}. Retrying in {delay}s")
+                await asyncio.sleep(delay)
+                error = await self._deliver(pending, [])
+                if error is None:
+                    return
+                if not _is_transient(error):
+                    break
+            self._log_failure(error, pending[0][0])
+        except (aiosmtplib.SMTPException, OSError) as e:
+            logger.error(f"Unexpected error retrying email to {pending[0][0]}: {str(e)}")
+
+    @staticmethod
+    def _log_failure(error: Exception, to_email: str) -> None:
+        if isinstance(error, aiosmtplib.SMTPAuthenticationError):
+            logger.error(f"SMTP Authentication failed: {str(error)}")
+            logger.error("Please check your Gmail App Password. Make sure 2FA is enabled and you're using an App Password, not your regular password.")
+        elif isinstance(error, aiosmtplib.SMTPConnectError):
+            logger.error(f"SMTP Connection failed: {str(error)}")
+            logger.error("Cannot connect to Gmail SMTP server. Check your internet connection.")
+        elif isinstance(error, (aiosmtplib.SMTPServerDisconnected, ConnectionError)):
+            logger.error(f"SMTP Server disconnected: {str(error)}")
+        else:
+            logger.error(f"SMTP error sending email to {to_email}: {str(error)}")
+
+    async def close(self) -> None:
+        """Cancel pending retries and close pooled SMTP connections (application shutdown)"""
+        if self._retries:
+            logger.warning(f"Dropping {len(self._retries)} pending email retries on shutdown")
+        retries = list(self._retries)
+        for task in retries:
+            task.cancel()
+        await asyncio.gather(*retries, return_exceptions=True)
+        await self.pool.close()
+
+    def booking_confirmation_email(self, booking: Booking, booking_summary: dict) -> Tuple[str, str, str]:
+        """Render the booking confirmation email for the customer"""
+        subject = _BOOKING_SUBJECT(booking_summary["total_tours"])
         
-        template = Template(html_template)
-        html_content = template.render(
-            customer_name=booking.customer_name,
-            start_date=booking.start_date.strftime("%B %d, %Y") if booking.start_date else "To be confirmed",
-            end_date=booking.end_date.strftime("%B %d, %Y") if booking.end_date else "To be confirmed",
-            customer_age=booking.customer_age,
-            additional_services=booking.additional_services,
-            number_of_people=booking.number_of_people,
-            total_tours=booking_summary["total_tours"],
-            total_locations=booking_summary["total_locations"],
-            tours_and_locations=booking_summary["tours_and_locations"]
+        html_content = _render_booking_html(
+            booking.customer_name,
+            _format_date(booking.start_date) if booking.start_date else "To be confirmed",
+            _format_date(booking.end_date) if booking.end_date else "To be confirmed",
+            booking.customer_age,
+            booking.additional_services,
+            booking.number_of_people,
+            booking_summary["total_tours"],
+            booking_summary["total_locations"],
+            _freeze_tours(booking_summary["tours_and_locations"])
         )
         
-        return self.send_email(booking.customer_email, subject, html_content)
+        return booking.customer_email, subject, html_content
 
-    def send_admin_notification(self, booking: Booking, booking_summary: dict):
-        """Send booking notification email to admin"""
-        subject = f"New Multi-Tour Booking - {booking.customer_name} ({len(booking.booking_tours)} tours)"
-        
-        html_template = """
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Multi-Tour Booking Notification</title>
-            <style>
-                body {
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    background-color: #f8f9fa;
-                    margin: 0;
-                    padding: 20px;
-                }
-                
-                .container {
-                    max-width: 650px;
-                    margin: 0 auto;
-                    background: white;
-                    border-radius: 8px;
-                    box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
-                    overflow: hidden;
-                }
-                
-                .header {
-                    background: #2563eb;
-                    color: white;
-                    padding: 24px;
-                    text-align: center;
-                }
-                
-                .header h1 {
-                    margin: 0;
-                    font-size: 24px;
-                    font-weight: 600;
-                }
-                
-                .stats-bar {
-                    background: #f1f5f9;
-                    padding: 24px;
-                    display: flex;
-                    justify-content: center;
-                    gap: 60px;
-                    border-bottom: 1px solid #e2e8f0;
-                }
-                
-                .stat {
-                    text-align: center;
-                    min-width: 120px;
-                }
-                
-                .stat-number {
-                    font-size: 28px;
-                    font-weight: 700;
-                    color: #2563eb;
-                    line-height: 1;
-                    margin-bottom: 8px;
-                }
-                
-                .stat-label {
-                    font-size: 14px;
-                    color: #64748b;
-                    font-weight: 500;
-                }
-                
-                .content {
-                    padding: 32px;
-                }
-                
-                .section {
-                    margin-bottom: 32px;
-                }
-                
-                .section:last-child {
-                    margin-bottom: 0;
-                }
-                
-                .section-title {
-                    font-size: 18px;
-                    font-weight: 600;
-                    color: #1f2937;
-                    margin-bottom: 16px;
-                    padding-bottom: 8px;
-                    border-bottom: 2px solid #e5e7eb;
-                }
-                
-                .info-row {
-                    display: flex;
-                    padding: 10px 0;
-                    border-bottom: 1px solid #f3f4f6;
-                }
-                
-                .info-row:last-child {
-                    border-bottom: none;
-                }
-                
-                .info-label {
-                    font-weight: 500;
-                    color: #6b7280;
-                    width: 140px;
-                    flex-shrink: 0;
-                }
-                
-                .info-value {
-                    color: #1f2937;
-                    font-weight: 500;
-                }
-                
-                .tour-card {
-                    background: #f8fafc;
-                    border: 1px solid #e2e8f0;
-                    border-radius: 8px;
-                    padding: 20px;
-                    margin-bottom: 16px;
-                }
-                
-                .tour-card:last-child {
-                    margin-bottom: 0;
-                }
-                
-                .tour-header {
-                    margin-bottom: 16px;
-                }
-                
-                .tour-title {
-                    font-size: 16px;
-                    font-weight: 600;
-                    color: #1f2937;
-                    margin-bottom: 4px;
-                }
-                
-                .tour-location {
-                    color: #6b7280;
-                    font-size: 14px;
-                }
-                
-                .locations-grid {
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                    gap: 8px;
-                    margin-top: 12px;
-                }
-                
-                .location-item {
-                    background: white;
-                    padding: 8px 12px;
-                    border-radius: 4px;
-                    border: 1px solid #e2e8f0;
-                    font-size: 14px;
-                    color: #374151;
-                }
-                
-                .location-count {
-                    font-size: 13px;
-                    color: #6b7280;
-                    margin-bottom: 8px;
-                }
-                
-                .footer {
-                    background: #f9fafb;
-                    padding: 20px 32px;
-                    border-top: 1px solid #e5e7eb;
-                    font-size: 14px;
-                    color: #6b7280;
-                    text-align: center;
-                }
-                
-                @media (max-width: 600px) {
-                    body {
-                        padding: 10px;
-                    }
-                    
-                    .content {
-                        padding: 24px;
-                    }
-                    
-                    .stats-bar {
-                        gap: 20px;
-                        padding: 16px;
-                    }
-                    
-                    .info-row {
-                        flex-direction: column;
-                        gap: 4px;
-                    }
-                    
-                    .info-label {
-                        width: auto;
-                        font-size: 14px;
-                    }
-                    
-                    .locations-grid {
-                        grid-template-columns: 1fr;
-                    }
-                }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>Multi-Tour Booking Received</h1>
-                </div>
-                
-                <div class="stats-bar">
-                    <div class="stat">
-                        <div class="stat-number">{{ total_tours }}</div>
-                        <div class="stat-label">Tours Selected</div>
-                    </div>
-                    <div class="stat">
-                        <div class="stat-number">{{ total_locations }}</div>
-                        <div class="stat-label">Total Locations</div>
-                    </div>
-                </div>
-                
-                <div class="content">
-                    <div class="section">
-                        <h2 class="section-title">Customer Details</h2>
-                        <div class="info-row">
-                            <span class="info-label">Name</span>
-                            <span class="info-value">{{ customer_name }}</span>
-                        </div>
-                        <div class="info-row">
-                            <span class="info-label">Email</span>
-                            <span class="info-value">{{ customer_email }}</span>
-                        </div>
-                        {% if customer_age %}
-                        <div class="info-row">
-                            <span class="info-label">Age</span>
-                            <span class="info-value">{{ customer_age }}</span>
-                        </div>
-                        {% endif %}
-                        <div class="info-row">
-                            <span class="info-label">Country</span>
-                            <span class="info-value">{{ customer_country }}</span>
-                        </div>
-                        <div class="info-row">
-                            <span class="info-label">Number of People</span>
-                            <span class="info-value">{{ number_of_people }}</span>
-                        </div>
-                        <div class="info-row">
-                            <span class="info-label">Start Date</span>
-                            <span class="info-value">{{ start_date }}</span>
-                        </div>
-                        <div class="info-row">
-                            <span class="info-label">End Date</span>
-                            <span class="info-value">{{ end_date }}</span>
-                        </div>
-                        {% if additional_services %}
-                        <div class="info-row">
-                            <span class="info-label">Additional Services</span>
-                            <span class="info-value">{{ additional_services }}</span>
-                        </div>
-                        {% endif %}
-                    </div>
-                    
-                    <div class="section">
-                        <h2 class="section-title">Selected Tours</h2>
-                        {% for tour in tours_and_locations %}
-                        <div class="tour-card">
-                            <div class="tour-header">
-                                <div class="tour-title">{{ loop.index }}. {{ tour.tour_name }}</div>
-                                <div class="tour-location">{{ tour.country }} • {{ tour.region }}</div>
-                            </div>
-                            <div class="location-count">{{ tour.selected_locations|length }} locations selected:</div>
-                            <div class="locations-grid">
-                                {% for location in tour.selected_locations %}
-                                <div class="location-item">{{ location.location_name }}</div>
-                                {% endfor %}
-                            </div>
-                        </div>
-                        {% endfor %}
-                    </div>
-                </div>
-                
-                <div class="footer">
-                    Booking received on {{ current_time }}
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        from datetime import datetime
+    def admin_notification_email(self, booking: Booking, booking_summary: dict) -> Tuple[str, str, str]:
+        """Render the booking notification email for the admin"""
+        subject = _ADMIN_SUBJECT((booking.customer_name, booking_summary["total_tours"]))
         
-        template = Template(html_template)
-        html_content = template.render(
+        html_content = self._get_template(self.ADMIN_TEMPLATE).render(
             customer_name=booking.customer_name,
             customer_email=booking.customer_email,
             customer_age=booking.customer_age,
             customer_country=booking.customer_country or "Not provided",
-            start_date=booking.start_date.strftime("%B %d, %Y") if booking.start_date else "Not specified",
-            end_date=booking.end_date.strftime("%B %d, %Y") if booking.end_date else "Not specified",
+            start_date=_format_date(booking.start_date) if booking.start_date else "Not specified",
+            end_date=_format_date(booking.end_date) if booking.end_date else "Not specified",
             additional_services=booking.additional_services,
             number_of_people=booking.number_of_people,
             total_tours=booking_summary["total_tours"],
             total_locations=booking_summary["total_locations"],
             tours_and_locations=booking_summary["tours_and_locations"],
-            current_time=datetime.now().strftime("%B %d, %Y at %I:%M %p")
+            current_time=_current_time()
         )
         
-        return self.send_email(self.admin_email, subject, html_content)
+        return self.admin_email, subject, html_content
 
-    def send_contact_form_email(self, name: str, email: str, subject: str, message: str):
+    async def send_booking_confirmation(self, booking: Booking, booking_summary: dict, retry: bool = False):
+        """Send booking confirmation email to customer"""
+        return await self.send_email(*self.booking_confirmation_email(booking, booking_summary), retry)
+
+    async def send_admin_notification(self, booking: Booking, booking_summary: dict, retry: bool = False):
+        """Send booking notification email to admin"""
+        return await self.send_email(*self.admin_notification_email(booking, booking_summary), retry)
+
+    async def send_booking_emails(self, booking: Booking, booking_summary: dict, retry: bool = True):
+        """Send the admin notification and customer confirmation in one SMTP session"""
+        # Admin first, so the business hears about the booking even if the
+        # customer's address turns out to be bad
+        return await self.send_emails([
+            self.admin_notification_email(booking, booking_summary),
+            self.booking_confirmation_email(booking, booking_summary)
+        ], retry)
+
+    async def send_batch(self, bookings: List[Tuple[Booking, dict]], retry: bool = True):
+        """Send confirmations for many (booking, booking_summary) pairs over one SMTP session"""
+        return await self.send_emails([
+            self.booking_confirmation_email(booking, booking_summary)
+            for booking, booking_summary in bookings
+        ], retry)
+
+    async def send_contact_form_email(self, name: str, email: str, subject: str, message: str, retry: bool = False):
         """Send contact form email to admin"""
-        admin_subject = f"Contact Form: {subject}"
-        
-        html_template = """
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Contact Form Submission</title>
-            <style>
-                body {
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    background-color: #f8f9fa;
-                    margin: 0;
-                    padding: 20px;
-                }
-                
-                .container {
-                    max-width: 600px;
-                    margin: 0 auto;
-                    background: white;
-                    border-radius: 8px;
-                    box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
-                    overflow: hidden;
-                }
-                
-                .header {
-                    background: #2E8B57;
-                    color: white;
-                    padding: 24px;
-                    text-align: center;
-                }
-                
-                .header h1 {
-                    margin: 0;
-                    font-size: 24px;
-                    font-weight: 600;
-                }
-                
-                .content {
-                    padding: 32px;
-                }
-                
-                .contact-info {
-                    background: #f8f9fa;
-                    padding: 20px;
-                    border-radius: 6px;
-                    margin-bottom: 24px;
-                    border-left: 4px solid #2E8B57;
-                }
-                
-                .info-row {
-                    display: flex;
-                    margin-bottom: 12px;
-                    align-items: center;
-                }
-                
-                .info-label {
-                    font-weight: 600;
-                    color: #2E8B57;
-                    min-width: 80px;
-                    margin-right: 16px;
-                }
-                
-                .info-value {
-                    color: #333;
-                }
-                
-                .message-section {
-                    margin-top: 24px;
-                }
-                
-                .message-title {
-                    font-size: 18px;
-                    font-weight: 600;
-                    color: #2E8B57;
-                    margin-bottom: 16px;
-                    border-bottom: 2px solid #e2e8f0;
-                    padding-bottom: 8px;
-                }
-                
-                .message-content {
-                    background: #f8f9fa;
-                    padding: 20px;
-                    border-radius: 6px;
-                    border: 1px solid #e2e8f0;
-                    white-space: pre-wrap;
-                    font-size: 15px;
-                    line-height: 1.6;
-                }
-                
-                .footer {
-                    background: #f1f5f9;
-                    padding: 20px;
-                    text-align: center;
-                    color: #64748b;
-                    font-size: 14px;
-                }
-                
-                .reply-button {
-                    display: inline-block;
-                    background: #2E8B57;
-                    color: white;
-                    padding: 12px 24px;
-                    text-decoration: none;
-                    border-radius: 6px;
-                    font-weight: 600;
-                    margin-top: 16px;
-                }
-                
-                .timestamp {
-                    color: #64748b;
-                    font-size: 14px;
-                    margin-top: 16px;
-                }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🌍 Afro Nyanka Tours</h1>
-                    <p style="margin: 8px 0 0 0; opacity: 0.9;">New Contact Form Submission</p>
-                </div>
-                
-                <div class="content">
-                    <div class="contact-info">
-                        <div class="info-row">
-                            <span class="info-label">Name:</span>
-                            <span class="info-value">{{ name }}</span>
-                        </div>
-                        <div class="info-row">
-                            <span class="info-label">Email:</span>
-                            <span class="info-value">{{ email }}</span>
-                        </div>
-                        <div class="info-row">
-                            <span class="info-label">Subject:</span>
-                            <span class="info-value">{{ subject }}</span>
-                        </div>
-                    </div>
-                    
-                    <div class="message-section">
-                        <div class="message-title">Message:</div>
-                        <div class="message-content">{{ message }}</div>
-                    </div>
-                    
-                    <div style="text-align: center;">
-                        <a href="mailto:{{ email }}?subject=Re: {{ subject }}" class="reply-button">
-                            Reply to {{ name }}
-                        </a>
-                    </div>
-                    
-                    <div class="timestamp">
-                        Received on {{ current_time }}
-                    </div>
-                </div>
-                
-                <div class="footer">
-                    <p>This message was sent through the Afro Nyanka Tours contact form.</p>
-                    <p>Please respond to the customer's inquiry as soon as possible.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        admin_subject = _CONTACT_SUBJECT(subject)
         
-        template = Template(html_template)
-        html_content = template.render(
+        html_content = self._get_template(self.CONTACT_TEMPLATE).render(
             name=name,
             email=email,
             subject=subject,
             message=message,
-            current_time=datetime.now().strftime("%B %d, %Y at %I:%M %p")
+            current_time=_current_time()
         )
         
-        return self.send_email(self.admin_email, admin_subject, html_content)
+        return await self.send_email(self.admin_email, admin_subject, html_content, retry)
 
 
 email_service = EmailService()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] != ["--precompile"]:
+        sys.exit("usage: python -m src.services.email_service --precompile [target.zip]")
+    target = sys.argv[2] if len(sys.argv) > 2 else settings.compiled_templates_path or "templates_compiled.zip"
+    compile_templates(target)
+    print(f"Compiled email templates to {target}")
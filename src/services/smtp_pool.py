@@ -0,0 +1,152 @@
+import asyncio
+import time
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import aiosmtplib
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledConnection:
+    """An authenticated SMTP session plus its usage bookkeeping"""
+
+    def __init__(self, server: aiosmtplib.SMTP):
+        self.server = server
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPPool:
+    """
+    Pool of authenticated SMTP sessions shared across sends
+
+    Connections are opened lazily (connect + TLS + login), checked with NOOP
+    before reuse, recycled after max_messages sends, and kept alive with a
+    periodic NOOP so the server's idle timeout doesn't drop them.
+    """
+
+    def __init__(
+        self,
+        server: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        size: int = 5,
+        max_messages: int = 100,
+        keepalive_interval: float = 240.0
+    ):
+        self.server = server
+        self.port = port
+        self.username = username
+        self.password = password
+        self.max_messages = max_messages
+        self.keepalive_interval = keepalive_interval
+
+        # Each slot is either an idle connection or None (not yet opened)
+        self._idle: "asyncio.Queue[Optional[_PooledConnection]]" = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(None)
+
+        self._keepalive_task: Optional[asyncio.Task] = None
+
+    async def _connect(self) -> _PooledConnection:
+        """Open a new authenticated SMTP session"""
+        use_tls = self.port == 465
+        logger.debug("Opening %s connection to %s:%s", "SMTP_SSL" if use_tls else "STARTTLS", self.server, self.port)
+        server = aiosmtplib.SMTP(
+            hostname=self.server,
+            port=self.port,
+            use_tls=use_tls,
+            start_tls=not use_tls
+        )
+        await server.connect()
+        try:
+            await server.login(self.username, self.password)
+        except (aiosmtplib.SMTPException, OSError):
+            # Don't leak the connected socket when authentication fails
+            server.close()
+            raise
+        return _PooledConnection(server)
+
+    @staticmethod
+    async def _close(conn: _PooledConnection) -> None:
+        try:
+            await conn.server.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            conn.server.close()
+
+    @staticmethod
+    async def _is_alive(conn: _PooledConnection) -> bool:
+        try:
+            response = await conn.server.noop()
+            return response.code == 250
+        except (aiosmtplib.SMTPException, OSError):
+            return False
+
+    def _ensure_keepalive(self) -> None:
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.create_task(self._keepalive())
+
+    async def _keepalive(self) -> None:
+        """Send NOOP on idle connections so they survive the server's idle timeout"""
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            for _ in range(self._idle.qsize()):
+                try:
+                    conn = self._idle.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if conn is not None and not await self._is_alive(conn):
+                    logger.info("Dropping idle SMTP connection that failed keepalive")
+                    await self._close(conn)
+                    conn = None
+                self._idle.put_nowait(conn)
+
+    @asynccontextmanager
+    async def get(self, messages: int = 1) -> AsyncIterator[aiosmtplib.SMTP]:
+        """
+        Check out an authenticated SMTP session, returning it to the pool afterwards
+
+        messages is how many emails the caller will send on the session, so
+        batched sends count towards max_messages correctly.
+        """
+        self._ensure_keepalive()
+        conn = await self._idle.get()
+        try:
+            if conn is not None and not await self._is_alive(conn):
+                await self._close(conn)
+                conn = None
+            if conn is None:
+                conn = await self._connect()
+
+            yield conn.server
+
+            conn.messages_sent += messages
+            conn.last_used = time.monotonic()
+            if conn.messages_sent >= self.max_messages:
+                await self._close(conn)
+                conn = None
+        except (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPResponseException, OSError):
+            # Don't hand a broken session to the next sender
+            if conn is not None:
+                await self._close(conn)
+            conn = None
+            raise
+        finally:
+            self._idle.put_nowait(conn)
+
+    async def close(self) -> None:
+        """Stop the keepalive task and close every idle connection"""
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        for _ in range(self._idle.qsize()):
+            try:
+                conn = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if conn is not None:
+                await self._close(conn)
+            self._idle.put_nowait(None)
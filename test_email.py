@@ -3,124 +3,418 @@
 Simple email test script to verify Gmail SMTP configuration
 """
 
+import asyncio
+import atexit
+import json
+import logging
 import os
+import queue
 import sys
 import smtplib
+import socket
+import ssl
+import threading
+import time
+import aiosmtplib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+
+logger = logging.getLogger(__name__)
+
+# Progress output is only printed with SMTP_TEST_VERBOSE set; the outcome is always logged
+VERBOSE = bool(os.getenv("SMTP_TEST_VERBOSE"))
+
+# Remembers which port worked last time so the next run tries it first
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "afro_nyanka_smtp.json")
+# Keeps a probe against a silently dropped port from stalling the test
+PROBE_TIMEOUT = 5
+# (port, mode) pairs to try; "ssl" is implicit TLS, "starttls" upgrades a plain connection
+METHODS = [(465, "ssl"), (587, "starttls")]
+# Queued sends are drained in batches of up to BATCH_SIZE, waiting up to
+# BATCH_WINDOW seconds for more to arrive after the first
+BATCH_SIZE = 32
+BATCH_WINDOW = 0.05
+
+
+class _ResumingContext(ssl.SSLContext):
+    """SSLContext that offers the last session negotiated with a host:port when reconnecting"""
+
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        if session is None:
+            session = _TLS_SESSIONS.get((server_hostname, sock.getpeername()[1]))
+        return super().wrap_socket(sock, *args, server_hostname=server_hostname, session=session, **kwargs)
+
+
+# Last TLS session per (host, port), so reconnects in this process can resume
+# instead of doing a full handshake. SSLSession can't be pickled, so sessions
+# don't outlive the process.
+_TLS_SESSIONS = {}
+
+# One TLS context (and certificate store load) shared by every connection;
+# same verification settings as ssl.create_default_context()
+TLS_CONTEXT = _ResumingContext(ssl.PROTOCOL_TLS_CLIENT)
+TLS_CONTEXT.load_default_certs()
+
+HTML_TEMPLATE = """
+<html>
+<body>
+    <h2>✅ Email Test Successful</h2>
+    <p>This is a test email to verify Gmail SMTP configuration is working.</p>
+    <p>Configuration details:</p>
+    <ul>
+        <li>SMTP Server: smtp.gmail.com:{port} ({mode})</li>
+        <li>From: {from_}</li>
+        <li>To: {to_}</li>
+    </ul>
+</body>
+</html>
+"""
+
+
+def _say(*args):
+    if VERBOSE:
+        print(*args)
+
+
+@lru_cache(maxsize=1)
+def _config():
+    """(SMTP_USERNAME, SMTP_PASSWORD, ADMIN_EMAIL), read from the environment once; call _config.cache_clear() to re-read"""
+    return os.getenv('SMTP_USERNAME'), os.getenv('SMTP_PASSWORD'), os.getenv('ADMIN_EMAIL')
+
+
+def _load_cached_port():
+    try:
+        with open(CACHE_PATH) as f:
+            return json.load(f).get("port")
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached_port(smtp_server, port, mode):
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, "w") as f:
+            json.dump({"host": smtp_server, "port": port, "mode": mode}, f)
+    except OSError:
+        pass
+
+
+def _preferred_method():
+    """(port, mode) named by SMTP_PREFER_PORT or the last successful run; None if unset or not in METHODS"""
+    preferred_port = str(os.getenv("SMTP_PREFER_PORT") or _load_cached_port())
+    return next((method for method in METHODS if str(method[0]) == preferred_port), None)
+
+
+@lru_cache(maxsize=None)
+def _resolve(host):
+    """Resolve the SMTP host once per run; fall back to the name if lookup fails"""
+    try:
+        return socket.getaddrinfo(host, None, socket.AF_INET, socket.SOCK_STREAM)[0][4][0]
+    except OSError:
+        return host
+
+
+class _TunedSocketMixin:
+    # Connect to the cached address; TLS still verifies against self._host,
+    # which keeps the original hostname. SMTP is small request/reply frames,
+    # so turn off Nagle's algorithm rather than let each command wait on it
+    def _get_socket(self, host, port, timeout):
+        sock = super()._get_socket(_resolve(host), port, timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+
+class _SMTP(_TunedSocketMixin, smtplib.SMTP):
+    pass
+
+
+class _SMTP_SSL(_TunedSocketMixin, smtplib.SMTP_SSL):
+    pass
+
+
+def _open(smtp_server, port, mode, smtp_username, smtp_password):
+    """Connect with one (port, mode) from METHODS and log in"""
+    if mode == "ssl":
+        server = _SMTP_SSL(smtp_server, port, timeout=PROBE_TIMEOUT, context=TLS_CONTEXT)
+    else:
+        server = _SMTP(smtp_server, port, timeout=PROBE_TIMEOUT)
+    _say(f"[OK] Connected to Gmail SMTP on port {port}")
+    try:
+        if mode == "starttls":
+            server.starttls(context=TLS_CONTEXT)
+            _say("[OK] STARTTLS successful")
+        server.login(smtp_username, smtp_password)
+    except Exception:
+        # Don't leak the connected socket when STARTTLS or login fails
+        server.close()
+        raise
+    _say(f"[OK] Authentication successful ({mode.upper()})")
+    # Saved after login: TLS 1.3 tickets only arrive once the server has replied
+    _TLS_SESSIONS[(smtp_server, port)] = server.sock.session
+    return server
+
+
+def _quit(server):
+    try:
+        server.quit()
+    except Exception:
+        pass
+
+
+def _quit_when_connected(future):
+    if future.exception() is None:
+        _quit(future.result())
+
+
+def _connect(smtp_server, smtp_username, smtp_password, methods):
+    """
+    Try the connection methods concurrently
+
+    Returns (server, port, mode) for the first method to log in, or raises
+    ConnectionError listing why each method failed. Connections that log in
+    later are closed.
+    """
+    for port, mode in methods:
+        _say(f"\n[..] Testing SMTP {mode.upper()} (port {port})...")
+
+    executor = ThreadPoolExecutor(len(methods))
+    futures = {
+        executor.submit(_open, smtp_server, port, mode, smtp_username, smtp_password): (port, mode)
+        for port, mode in methods
+    }
+    winner = None
+    errors = []
+    pending = set(futures)
+    while pending and winner is None:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            port, mode = futures[future]
+            try:
+                server = future.result()
+            except Exception as e:
+                _say(f"[FAIL] {mode.upper()} connection failed: {e}")
+                errors.append(f"{mode.upper()} (port {port}): {e}")
+                continue
+            if winner is None:
+                winner = (server, port, mode)
+            else:
+                _quit_when_connected(future)
+
+    # Don't wait for the slower probe; close it whenever it finishes
+    for future in pending:
+        future.add_done_callback(_quit_when_connected)
+    executor.shutdown(wait=False)
+    if winner is None:
+        raise ConnectionError("; ".join(errors))
+    return winner
+
+
+class GmailSender:
+    """
+    Authenticated Gmail session kept open across sends
+
+    Connects lazily on the first send, checks the session with NOOP before
+    reusing it, and reconnects once if the server has dropped it.
+    """
+
+    def __init__(self, smtp_server, smtp_username, smtp_password, attempts):
+        self.smtp_server = smtp_server
+        self.smtp_username = smtp_username
+        self.smtp_password = smtp_password
+        # Groups of connection methods, tried in order; each group is raced
+        self.attempts = attempts
+        self.server = None
+        self.port = None
+        self.mode = None
+        atexit.register(self.close)
+
+    def _is_alive(self):
+        try:
+            return self.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def connect(self):
+        """Return (port, mode) of a logged-in session, connecting if needed"""
+        if self.server is not None and self._is_alive():
+            return self.port, self.mode
+        self.close()
+        errors = []
+        for methods in self.attempts:
+            try:
+                self.server, self.port, self.mode = _connect(self.smtp_server, self.smtp_username, self.smtp_password, methods)
+                return self.port, self.mode
+            except ConnectionError as e:
+                errors.append(str(e))
+        raise ConnectionError(f"Could not connect to Gmail SMTP: {'; '.join(errors)}")
+
+    def send(self, message):
+        self.connect()
+        try:
+            self.server.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            self.server = None
+            self.connect()
+            self.server.send_message(message)
+
+    def close(self):
+        if self.server is not None:
+            _quit(self.server)
+            self.server = None
+
+
+_SENDERS = {}
+
+
+def get_sender(smtp_server, smtp_username, smtp_password, attempts):
+    """Shared GmailSender per account, so repeat sends reuse one session"""
+    key = (smtp_server, smtp_username, smtp_password)
+    if key not in _SENDERS:
+        _SENDERS[key] = GmailSender(smtp_server, smtp_username, smtp_password, attempts)
+    return _SENDERS[key]
+
+
+_OUTBOX = queue.Queue()
+
+
+def _drain():
+    """Send queued messages in batches, each over its sender's open session"""
+    while True:
+        batch = [_OUTBOX.get()]
+        deadline = time.monotonic() + BATCH_WINDOW
+        while len(batch) < BATCH_SIZE:
+            try:
+                batch.append(_OUTBOX.get(timeout=max(0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+        for sender, message, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                sender.send(message)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(None)
+
+
+def send_later(sender, message):
+    """Queue a message for the background sender; the returned Future resolves once it is sent"""
+    future = Future()
+    _OUTBOX.put((sender, message, future))
+    return future
+
+
+threading.Thread(target=_drain, name="smtp-outbox", daemon=True).start()
+
+
+def _build_message(smtp_username, admin_email, port, mode):
+    """Build the test email for the connection that won"""
+    label = "SSL" if mode == "ssl" else "STARTTLS"
+    html_content = HTML_TEMPLATE.format_map({
+        "port": port,
+        "mode": label,
+        "from_": smtp_username,
+        "to_": admin_email
+    })
+
+    # Single-part HTML body; no multipart envelope needed
+    message = MIMEText(html_content, "html")
+    message["Subject"] = "Test Email - Afro Nyanka Tours" + ("" if mode == "ssl" else f" ({label})")
+    message["From"] = smtp_username
+    message["To"] = admin_email
+    return message
+
 
 def test_email():
     # Get environment variables
-    smtp_username = os.getenv('SMTP_USERNAME')
-    smtp_password = os.getenv('SMTP_PASSWORD') 
-    admin_email = os.getenv('ADMIN_EMAIL')
-    
-    print(f"SMTP Username: {smtp_username}")
-    print(f"Admin Email: {admin_email}")
-    print(f"Password set: {'Yes' if smtp_password else 'No'}")
-    
+    smtp_username, smtp_password, admin_email = _config()
+
+    _say(f"SMTP Username: {smtp_username}")
+    _say(f"Admin Email: {admin_email}")
+    _say(f"Password set: {'Yes' if smtp_password else 'No'}")
+
     if not smtp_username or not smtp_password or not admin_email:
-        print("❌ Missing email configuration!")
-        print("Please set SMTP_USERNAME, SMTP_PASSWORD, and ADMIN_EMAIL environment variables")
+        logger.error("Missing email configuration: set SMTP_USERNAME, SMTP_PASSWORD and ADMIN_EMAIL")
         return False
-    
+
     # Test SMTP connection
     smtp_server = "smtp.gmail.com"
-    
-    # Try port 465 (SSL) first
-    print("\n🔄 Testing SMTP SSL (port 465)...")
-    try:
-        with smtplib.SMTP_SSL(smtp_server, 465) as server:
-            print("✅ Connected to Gmail SMTP SSL")
-            server.login(smtp_username, smtp_password)
-            print("✅ Authentication successful")
-            
-            # Send test email
-            message = MIMEMultipart()
-            message["Subject"] = "Test Email - Afro Nyanka Tours"
-            message["From"] = smtp_username
-            message["To"] = admin_email
-            
-            html_content = """
-            <html>
-            <body>
-                <h2>✅ Email Test Successful</h2>
-                <p>This is a test email to verify Gmail SMTP configuration is working.</p>
-                <p>Configuration details:</p>
-                <ul>
-                    <li>SMTP Server: smtp.gmail.com:465 (SSL)</li>
-                    <li>From: {}</li>
-                    <li>To: {}</li>
-                </ul>
-            </body>
-            </html>
-            """.format(smtp_username, admin_email)
-            
-            message.attach(MIMEText(html_content, "html"))
-            server.sendmail(smtp_username, admin_email, message.as_string())
-            print("✅ Test email sent successfully via SSL!")
-            return True
-            
-    except Exception as e:
-        print(f"❌ SSL connection failed: {e}")
-    
-    # Try port 587 (STARTTLS) as fallback
-    print("\n🔄 Testing SMTP STARTTLS (port 587)...")
+
+    # Race SSL (465) and STARTTLS (587) so a silently dropped port doesn't
+    # stall the test; if SMTP_PREFER_PORT or the last successful run names a
+    # port, try that one on its own first
+    preferred = _preferred_method()
+    attempts = [[preferred], [m for m in METHODS if m != preferred]] if preferred else [METHODS]
+
+    sender = get_sender(smtp_server, smtp_username, smtp_password, attempts)
     try:
-        with smtplib.SMTP(smtp_server, 587) as server:
-            print("✅ Connected to Gmail SMTP")
-            server.starttls()
-            print("✅ STARTTLS successful")
-            server.login(smtp_username, smtp_password)
-            print("✅ Authentication successful")
-            
-            # Send test email
-            message = MIMEMultipart()
-            message["Subject"] = "Test Email - Afro Nyanka Tours (STARTTLS)"
-            message["From"] = smtp_username
-            message["To"] = admin_email
-            
-            html_content = """
-            <html>
-            <body>
-                <h2>✅ Email Test Successful</h2>
-                <p>This is a test email to verify Gmail SMTP configuration is working.</p>
-                <p>Configuration details:</p>
-                <ul>
-                    <li>SMTP Server: smtp.gmail.com:587 (STARTTLS)</li>
-                    <li>From: {}</li>
-                    <li>To: {}</li>
-                </ul>
-            </body>
-            </html>
-            """.format(smtp_username, admin_email)
-            
-            message.attach(MIMEText(html_content, "html"))
-            server.sendmail(smtp_username, admin_email, message.as_string())
-            print("✅ Test email sent successfully via STARTTLS!")
-            return True
-            
+        port, mode = sender.connect()
+        send_later(sender, _build_message(smtp_username, admin_email, port, mode)).result()
+        logger.info("SMTP test email sent mode=%s port=%s", mode, port)
+        _save_cached_port(smtp_server, port, mode)
+        return True
     except Exception as e:
-        print(f"❌ STARTTLS connection failed: {e}")
-    
-    print("\n❌ Both SMTP methods failed!")
-    print("\n🔧 Troubleshooting tips:")
-    print("1. Make sure 2-Factor Authentication is enabled on your Gmail account")
-    print("2. Generate an App Password (not your regular Gmail password)")
-    print("3. Use the App Password in SMTP_PASSWORD environment variable")
-    print("4. Check that your Gmail account allows 'Less secure app access' (if not using App Password)")
-    print("5. Verify your internet connection")
-    
+        logger.error("SMTP test email failed: %s", e)
+        if not VERBOSE:
+            logger.error("Set SMTP_TEST_VERBOSE=1 for per-step output and troubleshooting tips")
+
+    _say("\n[HELP] Troubleshooting tips:")
+    _say("1. Make sure 2-Factor Authentication is enabled on your Gmail account")
+    _say("2. Generate an App Password (not your regular Gmail password)")
+    _say("3. Use the App Password in SMTP_PASSWORD environment variable")
+    _say("4. Check that your Gmail account allows 'Less secure app access' (if not using App Password)")
+    _say("5. Verify your internet connection")
+
     return False
 
+async def test_email_async():
+    """Same check on aiosmtplib, for callers already running an event loop"""
+    smtp_username, smtp_password, admin_email = _config()
+
+    if not smtp_username or not smtp_password or not admin_email:
+        logger.error("Missing email configuration: set SMTP_USERNAME, SMTP_PASSWORD and ADMIN_EMAIL")
+        return False
+
+    smtp_server = "smtp.gmail.com"
+    port, mode = _preferred_method() or METHODS[0]
+
+    _say(f"\n[..] Testing SMTP {mode.upper()} (port {port}) with aiosmtplib...")
+    try:
+        smtp = aiosmtplib.SMTP(
+            hostname=smtp_server,
+            port=port,
+            use_tls=mode == "ssl",
+            start_tls=mode == "starttls",
+            tls_context=TLS_CONTEXT,
+            timeout=PROBE_TIMEOUT
+        )
+        await smtp.connect()
+        try:
+            await smtp.login(smtp_username, smtp_password)
+            await smtp.send_message(_build_message(smtp_username, admin_email, port, mode))
+        finally:
+            await smtp.quit()
+    except (aiosmtplib.SMTPException, OSError) as e:
+        logger.error("SMTP test email failed mode=%s port=%s: %s", mode, port, e)
+        return False
+
+    logger.info("SMTP test email sent mode=%s port=%s", mode, port)
+    _save_cached_port(smtp_server, port, mode)
+    return True
+
+
 if __name__ == "__main__":
-    print("🧪 Gmail SMTP Configuration Test")
-    print("=" * 40)
-    
-    success = test_email()
-    
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    _say("Gmail SMTP Configuration Test")
+    _say("=" * 40)
+
+    # --async runs the check on aiosmtplib instead of the threaded smtplib race
+    success = asyncio.run(test_email_async()) if "--async" in sys.argv[1:] else test_email()
+
     if success:
-        print("\n🎉 Email configuration is working correctly!")
+        _say("\n[OK] Email configuration is working correctly!")
     else:
-        print("\n💥 Email configuration needs to be fixed!")
+        _say("\n[FAIL] Email configuration needs to be fixed!")
         sys.exit(1)